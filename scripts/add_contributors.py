@@ -18,9 +18,11 @@ Requirements:
 """
 
 import argparse
+import itertools
 import json
 import logging
 import os
+import random
 import sys
 import time
 from typing import Dict, List, Optional, Tuple
@@ -33,14 +35,25 @@ except ImportError:
     sys.exit(1)
 
 
+# Largest page size the GitHub REST API allows for list endpoints
+API_PAGE_SIZE = 100
+
+# Upper bound in seconds on the backoff between retries, before jitter
+MAX_RETRY_DELAY = 30
+
+
 class ContributorAutomation:
     """Main class for handling contributor automation."""
     
     def __init__(self, config_path: str = "config/contributor-config.json"):
         """Initialize the automation system."""
         self.config = self._load_config(config_path)
+        self.valid_permissions = frozenset(self.config['permission_levels'].values())
         self.github = None
         self.repo = None
+        self.collaborators = None
+        self.invitations = None
+        self.user_cache = {}
         self.logger = self._setup_logging()
         
     def _load_config(self, config_path: str) -> Dict:
@@ -60,9 +73,16 @@ class ContributorAutomation:
         logger = logging.getLogger('contributor-automation')
         logger.setLevel(getattr(logging, self.config['logging']['level']))
         
+        # Drop handlers left by earlier instances so each record is written once
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+            handler.close()
+            
         # Create logs directory if it doesn't exist
         log_file = self.config['logging']['file']
-        os.makedirs(os.path.dirname(log_file), exist_ok=True)
+        log_dir = os.path.dirname(log_file)
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
         
         # File handler
         file_handler = logging.FileHandler(log_file)
@@ -88,7 +108,11 @@ class ContributorAutomation:
     def initialize_github(self, token: str, repository: str) -> bool:
         """Initialize GitHub API connection."""
         try:
-            self.github = Github(token, timeout=self.config['api']['timeout'])
+            self.github = Github(
+                token,
+                timeout=self.config['api']['timeout'],
+                per_page=API_PAGE_SIZE
+            )
             self.repo = self.github.get_repo(repository)
             self.logger.info(f"Successfully connected to repository: {repository}")
             return True
@@ -101,21 +125,53 @@ class ContributorAutomation:
             
     def validate_permission(self, permission: str) -> bool:
         """Validate permission level."""
-        valid_permissions = list(self.config['permission_levels'].values())
-        if permission not in valid_permissions:
+        # Unhashable values (e.g. a list from a batch file) can't be set members
+        if not isinstance(permission, str) or permission not in self.valid_permissions:
+            valid_options = self.config['permission_levels'].values()
             self.logger.error(
                 f"Invalid permission level: {permission}. "
-                f"Valid options: {', '.join(valid_permissions)}"
+                f"Valid options: {', '.join(valid_options)}"
             )
             return False
         return True
         
+    def load_collaborators(self, batch_size: int) -> bool:
+        """Prefetch collaborator logins when cheaper than per-user checks."""
+        try:
+            collaborators = self.repo.get_collaborators()
+            # totalCount is one request; the listing costs one per page
+            page_count = -(-collaborators.totalCount // API_PAGE_SIZE)
+            if 1 + page_count >= batch_size:
+                return False
+                
+            self.collaborators = {
+                collaborator.login.lower() for collaborator in collaborators
+            }
+            return True
+        except GithubException as e:
+            self.logger.warning(
+                f"Could not prefetch collaborators, checking individually: {e}"
+            )
+            self.collaborators = None
+            return False
+            
+    def is_collaborator(self, user) -> bool:
+        """Check collaborator status, using the prefetched set if available."""
+        if self.collaborators is not None:
+            return user.login.lower() in self.collaborators
+        return self.repo.has_in_collaborators(user)
+        
     def get_user_by_username(self, username: str) -> Optional[object]:
         """Get GitHub user by username."""
         try:
+            cache_key = ('username', username.lower())
+            if cache_key in self.user_cache:
+                return self.user_cache[cache_key]
+                
             user = self.github.get_user(username)
             # Trigger API call to check if user exists
             _ = user.login
+            self.user_cache[cache_key] = user
             return user
         except GithubException as e:
             if e.status == 404:
@@ -130,9 +186,14 @@ class ContributorAutomation:
     def get_user_by_email(self, email: str) -> Optional[object]:
         """Get GitHub user by email (search)."""
         try:
+            cache_key = ('email', email.lower())
+            if cache_key in self.user_cache:
+                return self.user_cache[cache_key]
+                
             # Search for users by email
             users = self.github.search_users(f"{email} in:email")
-            user_list = list(users)
+            # Two results are enough to detect ambiguity; skip further pages
+            user_list = list(itertools.islice(users, 2))
             
             if not user_list:
                 self.logger.error(f"No user found with email: {email}")
@@ -144,6 +205,7 @@ class ContributorAutomation:
                     f"Using first result: {user_list[0].login}"
                 )
                 
+            self.user_cache[cache_key] = user_list[0]
             return user_list[0]
         except GithubException as e:
             self.logger.error(f"Error searching for user with email {email}: {e}")
@@ -182,9 +244,18 @@ class ContributorAutomation:
         if not user:
             return False
             
+        # Pending invitations are not collaborators yet, so track them per batch
+        if self.invitations is not None:
+            if self.invitations.get(user.login.lower()) == permission:
+                self.logger.warning(
+                    f"Invitation already sent to {user.login} "
+                    f"with {permission} permission"
+                )
+                return True
+                
         # Check if user is already a collaborator
         try:
-            if self.repo.has_in_collaborators(user):
+            if self.is_collaborator(user):
                 self.logger.warning(
                     f"User {user.login} is already a collaborator"
                 )
@@ -194,9 +265,13 @@ class ContributorAutomation:
             return False
             
         # Add user as collaborator with retry logic
-        for attempt in range(self.config['api']['retry_attempts']):
+        retry_attempts = self.config['api']['retry_attempts']
+        retry_delay = self.config['api']['retry_delay']
+        for attempt in range(retry_attempts):
             try:
                 self.repo.add_to_collaborators(user, permission)
+                if self.invitations is not None:
+                    self.invitations[user.login.lower()] = permission
                 self.logger.info(
                     f"Successfully added {user.login} as collaborator "
                     f"with {permission} permission"
@@ -213,16 +288,24 @@ class ContributorAutomation:
                         f"Invalid request when adding collaborator: {e}"
                     )
                     return False
+                elif 400 <= e.status < 500 and e.status != 429:
+                    # Client errors will fail the same way on every attempt
+                    self.logger.error(
+                        f"Request rejected when adding collaborator: {e}"
+                    )
+                    return False
                 else:
                     self.logger.warning(
                         f"Attempt {attempt + 1} failed: {e}"
                     )
-                    if attempt < self.config['api']['retry_attempts'] - 1:
-                        time.sleep(self.config['api']['retry_delay'])
+                    if attempt < retry_attempts - 1:
+                        # Exponential backoff with jitter so parallel runs don't retry in lockstep
+                        delay = min(MAX_RETRY_DELAY, retry_delay * (2 ** attempt))
+                        time.sleep(delay * random.uniform(0.5, 1.5))
                     else:
                         self.logger.error(
                             f"Failed to add collaborator after "
-                            f"{self.config['api']['retry_attempts']} attempts"
+                            f"{retry_attempts} attempts"
                         )
                         return False
             except Exception as e:
@@ -246,13 +329,24 @@ class ContributorAutomation:
         success_count = 0
         total_count = len(contributors)
         
-        for contributor in contributors:
-            username = contributor.get('username')
-            email = contributor.get('email')
-            permission = contributor.get('permission', self.config['default_permission'])
+        # A paginated listing only pays off when it needs fewer requests than
+        # one membership check per contributor, which takes at least three
+        if self.repo and total_count > 2:
+            self.load_collaborators(total_count)
             
-            if self.add_contributor(username=username, email=email, permission=permission):
-                success_count += 1
+        default_permission = self.config['default_permission']
+        self.invitations = {}
+        try:
+            for contributor in contributors:
+                username = contributor.get('username')
+                email = contributor.get('email')
+                permission = contributor.get('permission', default_permission)
+                
+                if self.add_contributor(username=username, email=email, permission=permission):
+                    success_count += 1
+        finally:
+            self.collaborators = None
+            self.invitations = None
                 
         self.logger.info(f"Batch processing complete: {success_count}/{total_count} successful")
         return success_count, total_count
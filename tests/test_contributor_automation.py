@@ -17,7 +17,7 @@ from unittest.mock import Mock, patch, MagicMock
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
 
 try:
-    from add_contributors import ContributorAutomation
+    from add_contributors import ContributorAutomation, GithubException, MAX_RETRY_DELAY
 except ImportError as e:
     print(f"Error importing ContributorAutomation: {e}")
     sys.exit(1)
@@ -77,6 +77,14 @@ class TestContributorAutomation(unittest.TestCase):
         if os.path.exists("test_logs"):
             os.rmdir("test_logs")
     
+    def test_logging_handlers_not_duplicated(self):
+        """Test creating another instance does not stack log handlers."""
+        handler_count = len(self.automation.logger.handlers)
+        
+        automation = ContributorAutomation(self.temp_config.name)
+        
+        self.assertEqual(len(automation.logger.handlers), handler_count)
+        
     def test_config_loading(self):
         """Test configuration loading."""
         self.assertEqual(self.automation.config['default_permission'], 'pull')
@@ -96,6 +104,7 @@ class TestContributorAutomation(unittest.TestCase):
         self.assertFalse(self.automation.validate_permission('invalid'))
         self.assertFalse(self.automation.validate_permission(''))
         self.assertFalse(self.automation.validate_permission('write'))  # Should be 'push'
+        self.assertFalse(self.automation.validate_permission(['push']))
         
     @patch('add_contributors.Github')
     def test_github_initialization(self, mock_github):
@@ -110,7 +119,7 @@ class TestContributorAutomation(unittest.TestCase):
         self.assertTrue(result)
         self.assertEqual(self.automation.github, mock_github_instance)
         self.assertEqual(self.automation.repo, mock_repo)
-        mock_github.assert_called_once_with('test_token', timeout=30)
+        mock_github.assert_called_once_with('test_token', timeout=30, per_page=100)
         mock_github_instance.get_repo.assert_called_once_with('owner/repo')
         
     @patch('add_contributors.Github')
@@ -150,7 +159,40 @@ class TestContributorAutomation(unittest.TestCase):
         result = self.automation.get_user_by_username('nonexistent')
         
         self.assertIsNone(result)
+    
+    def test_get_user_by_username_cached(self):
+        """Test repeated username lookups reuse the cached user."""
+        mock_github_instance = Mock()
+        mock_user = Mock()
+        mock_user.login = 'testuser'
+        
+        self.automation.github = mock_github_instance
+        mock_github_instance.get_user.return_value = mock_user
+        
+        self.assertEqual(self.automation.get_user_by_username('testuser'), mock_user)
+        self.assertEqual(self.automation.get_user_by_username('TestUser'), mock_user)
+        mock_github_instance.get_user.assert_called_once_with('testuser')
         
+    def test_get_user_by_username_not_string(self):
+        """Test a non-string username is logged and rejected, not raised."""
+        self.automation.github = Mock()
+        
+        self.assertIsNone(self.automation.get_user_by_username(123))
+        self.automation.github.get_user.assert_not_called()
+        
+    def test_get_user_by_email_cached(self):
+        """Test repeated email lookups reuse the cached user."""
+        mock_github_instance = Mock()
+        mock_user = Mock()
+        mock_user.login = 'testuser'
+        
+        self.automation.github = mock_github_instance
+        mock_github_instance.search_users.return_value = [mock_user]
+        
+        self.assertEqual(self.automation.get_user_by_email('test@example.com'), mock_user)
+        self.assertEqual(self.automation.get_user_by_email('Test@Example.com'), mock_user)
+        mock_github_instance.search_users.assert_called_once_with('test@example.com in:email')
+    
     @patch('add_contributors.Github')
     def test_get_user_by_email(self, mock_github):
         """Test getting user by email."""
@@ -166,6 +208,25 @@ class TestContributorAutomation(unittest.TestCase):
         self.assertEqual(result, mock_user)
         mock_github_instance.search_users.assert_called_once_with('test@example.com in:email')
         
+    def test_get_user_by_email_reads_at_most_two_results(self):
+        """Test email search stops after two results and warns on ambiguity."""
+        users = []
+        for login in ('first', 'second', 'third', 'fourth'):
+            user = Mock()
+            user.login = login
+            users.append(user)
+        results = iter(users)
+        
+        self.automation.github = Mock()
+        self.automation.github.search_users.return_value = results
+        
+        with self.assertLogs('contributor-automation', level='WARNING') as logs:
+            result = self.automation.get_user_by_email('shared@example.com')
+        
+        self.assertEqual(result, users[0])
+        self.assertEqual(list(results), users[2:])
+        self.assertTrue(any("Multiple users found" in line for line in logs.output))
+        
     def test_batch_file_processing(self):
         """Test batch file processing."""
         # Create a temporary batch file
@@ -196,6 +257,193 @@ class TestContributorAutomation(unittest.TestCase):
         
         self.assertEqual(success_count, 0)
         self.assertEqual(total_count, 0)
+    
+    def test_batch_prefetches_collaborators(self):
+        """Test batch processing checks collaborators from a single listing."""
+        batch_data = [
+            {"username": "existing", "permission": "pull"},
+            {"username": "newuser", "permission": "push"},
+            {"username": "newuser", "permission": "push"}
+        ]
+        
+        temp_batch = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
+        json.dump(batch_data, temp_batch)
+        temp_batch.close()
+        
+        existing = Mock()
+        existing.login = 'Existing'
+        newuser = Mock()
+        newuser.login = 'newuser'
+        
+        self.automation.github = Mock()
+        self.automation.github.get_user.side_effect = (
+            lambda name: existing if name == 'existing' else newuser
+        )
+        collaborators = MagicMock()
+        collaborators.totalCount = 1
+        collaborators.__iter__.return_value = iter([existing])
+        self.automation.repo = Mock()
+        self.automation.repo.get_collaborators.return_value = collaborators
+        
+        try:
+            success_count, total_count = self.automation.process_batch_file(temp_batch.name)
+            
+            self.assertEqual(success_count, 3)
+            self.assertEqual(total_count, 3)
+            self.automation.repo.get_collaborators.assert_called_once()
+            self.automation.repo.has_in_collaborators.assert_not_called()
+            self.automation.repo.add_to_collaborators.assert_called_once_with(newuser, 'push')
+            self.assertIsNone(self.automation.collaborators)
+        finally:
+            os.unlink(temp_batch.name)
+    
+    def test_batch_duplicate_with_new_permission_resends_invitation(self):
+        """Test a repeated user is re-invited only when the permission changes."""
+        batch_data = [
+            {"username": "newuser", "permission": "pull"},
+            {"username": "newuser", "permission": "admin"},
+            {"username": "newuser", "permission": "admin"}
+        ]
+        
+        temp_batch = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
+        json.dump(batch_data, temp_batch)
+        temp_batch.close()
+        
+        newuser = Mock()
+        newuser.login = 'newuser'
+        
+        self.automation.github = Mock()
+        self.automation.github.get_user.return_value = newuser
+        self.automation.repo = Mock()
+        self.automation.repo.get_collaborators.side_effect = GithubException(
+            403, {"message": "Forbidden"}, None
+        )
+        self.automation.repo.has_in_collaborators.return_value = False
+        
+        try:
+            with self.assertLogs('contributor-automation', level='WARNING') as logs:
+                success_count, total_count = self.automation.process_batch_file(temp_batch.name)
+            
+            self.assertEqual(success_count, 3)
+            self.assertEqual(total_count, 3)
+            self.assertEqual(
+                self.automation.repo.add_to_collaborators.call_args_list,
+                [((newuser, 'pull'),), ((newuser, 'admin'),)]
+            )
+            self.assertTrue(
+                any("Invitation already sent to newuser" in line for line in logs.output)
+            )
+            self.assertIsNone(self.automation.invitations)
+        finally:
+            os.unlink(temp_batch.name)
+    
+    def test_small_batch_skips_collaborator_listing(self):
+        """Test batches too small to benefit do not list collaborators."""
+        batch_data = [
+            {"username": "user1", "permission": "pull"},
+            {"username": "user2", "permission": "push"}
+        ]
+        
+        temp_batch = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
+        json.dump(batch_data, temp_batch)
+        temp_batch.close()
+        
+        self.automation.repo = Mock()
+        
+        try:
+            with patch.object(self.automation, 'add_contributor', return_value=True):
+                self.automation.process_batch_file(temp_batch.name)
+            
+            self.automation.repo.get_collaborators.assert_not_called()
+        finally:
+            os.unlink(temp_batch.name)
+    
+    def test_load_collaborators_skipped_when_listing_costs_more(self):
+        """Test prefetch is skipped when paging would exceed per-user checks."""
+        collaborators = MagicMock()
+        collaborators.totalCount = 250
+        self.automation.repo = Mock()
+        self.automation.repo.get_collaborators.return_value = collaborators
+        
+        self.assertFalse(self.automation.load_collaborators(4))
+        self.assertIsNone(self.automation.collaborators)
+        collaborators.__iter__.assert_not_called()
+        
+    def test_load_collaborators_failure_falls_back(self):
+        """Test a failed listing falls back to per-user collaborator checks."""
+        mock_user = Mock()
+        mock_user.login = 'testuser'
+        self.automation.repo = Mock()
+        self.automation.repo.get_collaborators.side_effect = GithubException(
+            403, {"message": "Forbidden"}, None
+        )
+        self.automation.repo.has_in_collaborators.return_value = True
+        
+        self.assertFalse(self.automation.load_collaborators(10))
+        self.assertIsNone(self.automation.collaborators)
+        self.assertTrue(self.automation.is_collaborator(mock_user))
+        self.automation.repo.has_in_collaborators.assert_called_once_with(mock_user)
+    
+    def test_add_contributor_client_error_not_retried(self):
+        """Test client errors fail fast without retrying."""
+        mock_user = Mock()
+        mock_user.login = 'testuser'
+        
+        self.automation.github = Mock()
+        self.automation.github.get_user.return_value = mock_user
+        self.automation.repo = Mock()
+        self.automation.repo.has_in_collaborators.return_value = False
+        self.automation.repo.add_to_collaborators.side_effect = GithubException(
+            404, {"message": "Not Found"}, None
+        )
+        
+        with patch('add_contributors.time.sleep') as mock_sleep:
+            result = self.automation.add_contributor(username='testuser', permission='push')
+        
+        self.assertFalse(result)
+        self.automation.repo.add_to_collaborators.assert_called_once_with(mock_user, 'push')
+        mock_sleep.assert_not_called()
+    
+    def test_add_contributor_retries_with_backoff(self):
+        """Test server errors are retried with growing, jittered delays."""
+        mock_user = Mock()
+        mock_user.login = 'testuser'
+        
+        self.automation.github = Mock()
+        self.automation.github.get_user.return_value = mock_user
+        self.automation.repo = Mock()
+        self.automation.repo.has_in_collaborators.return_value = False
+        self.automation.repo.add_to_collaborators.side_effect = [
+            GithubException(502, {"message": "Bad Gateway"}, None),
+            GithubException(502, {"message": "Bad Gateway"}, None),
+            None
+        ]
+        
+        with patch('add_contributors.time.sleep') as mock_sleep:
+            result = self.automation.add_contributor(username='testuser', permission='push')
+        
+        self.assertTrue(result)
+        self.assertEqual(self.automation.repo.add_to_collaborators.call_count, 3)
+        first_delay, second_delay = [c.args[0] for c in mock_sleep.call_args_list]
+        self.assertTrue(0.5 <= first_delay <= 1.5)
+        self.assertTrue(1.0 <= second_delay <= 3.0)
+        
+        # Large configured values are capped before jitter is applied
+        self.automation.config['api']['retry_attempts'] = 10
+        self.automation.config['api']['retry_delay'] = 2
+        self.automation.repo.add_to_collaborators.reset_mock()
+        self.automation.repo.add_to_collaborators.side_effect = GithubException(
+            502, {"message": "Bad Gateway"}, None
+        )
+        
+        with patch('add_contributors.time.sleep') as mock_sleep:
+            result = self.automation.add_contributor(username='testuser', permission='push')
+        
+        self.assertFalse(result)
+        delays = [c.args[0] for c in mock_sleep.call_args_list]
+        self.assertEqual(len(delays), 9)
+        self.assertTrue(all(delay <= MAX_RETRY_DELAY * 1.5 for delay in delays))
+        self.assertTrue(delays[-1] >= MAX_RETRY_DELAY * 0.5)
 
 
 class TestConfiguration(unittest.TestCase):
@@ -217,6 +465,32 @@ class TestConfiguration(unittest.TestCase):
                 ContributorAutomation(temp_config.name)
         finally:
             os.unlink(temp_config.name)
+    
+    def test_log_file_without_directory(self):
+        """Test logging to a bare file name in the working directory."""
+        config_data = {
+            "permission_levels": {"read": "pull"},
+            "default_permission": "pull",
+            "logging": {"level": "INFO", "file": "test.log", "console": False},
+            "api": {"timeout": 30, "retry_attempts": 1, "retry_delay": 0}
+        }
+        
+        original_cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_path = os.path.join(temp_dir, 'config.json')
+            with open(config_path, 'w') as f:
+                json.dump(config_data, f)
+            
+            os.chdir(temp_dir)
+            try:
+                automation = ContributorAutomation(config_path)
+                self.assertTrue(os.path.exists('test.log'))
+                
+                for handler in list(automation.logger.handlers):
+                    automation.logger.removeHandler(handler)
+                    handler.close()
+            finally:
+                os.chdir(original_cwd)
 
 
 def run_functional_tests():